@@ -1,6 +1,9 @@
+import collections
 import io
 import logging
+import mmap
 import pathlib
+import sys
 
 from cirbo.core.circuit import gate
 from cirbo.core.circuit.circuit import Circuit
@@ -17,12 +20,66 @@ def load_aig(file_path: str) -> Circuit:
     return AIGParser().parse_file(file_path)
 
 
+def _decode_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    """Decode an AIGER LEB128 number at *pos*; return (value, next offset)."""
+    if pos >= len(buf):
+        raise AIGParseError("Unexpected EOF decoding number")
+    # Fast path: most AIG deltas fit in a single 7-bit group.
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    result = byte & 0x7F
+    shift = 7
+    pos += 1
+    while True:
+        if pos >= len(buf):
+            raise AIGParseError("Unexpected EOF decoding number")
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _decode_and_body(
+    buf: bytes, pos: int, num_ands: int, first_lhs: int
+) -> tuple[list[tuple[int, int, int]], int]:
+    """Decode *num_ands* delta pairs into (lhs, rhs0, rhs1) triples.
+
+    The dominant single-byte case is decoded inline; rare multi-byte
+    deltas fall back to `_decode_varint`, so the whole AND body is
+    consumed by one tight loop without a function call per gate.
+    """
+    size = len(buf)
+    triples: list[tuple[int, int, int]] = []
+    lhs = first_lhs
+    for _ in range(num_ands):
+        pair = []
+        for _ in range(2):
+            if pos >= size:
+                raise AIGParseError("Unexpected EOF decoding number")
+            byte = buf[pos]
+            if byte < 0x80:
+                pair.append(byte)
+                pos += 1
+                continue
+            value, pos = _decode_varint(buf, pos)
+            pair.append(value)
+        rhs0 = lhs - pair[0]
+        rhs1 = rhs0 - pair[1]
+        triples.append((lhs, rhs0, rhs1))
+        lhs += 2
+    return triples, pos
+
+
 class AIGParser:
     """Parser for AIGER format files (both ASCII .aag and binary .aig)."""
 
     def __init__(self):
         self._circuit: Circuit = Circuit()
         self._literal_to_label: dict[int, gate.Label] = {}
+        self._not_of: dict[int, gate.Label] = {}
         self._symbols: dict[str, dict[int, str]] = {'i': {}, 'o': {}, 'l': {}}
 
     def parse_file(
@@ -30,8 +87,7 @@ class AIGParser:
     ) -> Circuit:
         path = pathlib.Path(file_path)
         if binary:
-            with path.open('rb') as f:
-                return self._parse_binary(f, strict_header=False)
+            return self._parse_binary_file(path, strict_header=False)
         elif binary is False:
             with path.open('r') as f:
                 return self._parse_ascii(f, strict_header=False)
@@ -40,21 +96,41 @@ class AIGParser:
                 with path.open('r') as f:
                     return self._parse_ascii(f)
             elif path.suffix == '.aig':
-                with path.open('rb') as f:
-                    return self._parse_binary(f)
+                return self._parse_binary_file(path)
             else:
                 raise AIGParseError(
                     f"Unknown file extension: {path.suffix}"
                 )
 
+    def _parse_binary_file(
+        self, path: pathlib.Path, *, strict_header: bool = True
+    ) -> Circuit:
+        with path.open('rb') as f:
+            try:
+                # Zero-copy view over the file; the decoder indexes it as
+                # a plain buffer.
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty or unmappable file — fall back to reading it.
+                return self._parse_binary(
+                    f.read(), strict_header=strict_header
+                )
+            with mm:
+                return self._parse_binary(mm, strict_header=strict_header)
+
     # ----- ASCII format -----
 
     def _parse_ascii(self, stream, *, strict_header: bool = True) -> Circuit:
         self._circuit = Circuit()
         self._literal_to_label = {}
+        self._not_of = {}
         self._symbols = {'i': {}, 'o': {}, 'l': {}}
 
-        header_line = stream.readline().strip()
+        lines = stream.read().split('\n')
+        pos = 0
+
+        header_line = lines[pos].strip() if lines else ''
+        pos += 1
         header_parts = header_line.split()
         valid_headers = ['aag'] if strict_header else ['aag', 'aig']
         if len(header_parts) < 6 or header_parts[0] not in valid_headers:
@@ -63,32 +139,42 @@ class AIGParser:
         m, i, l, o, a = map(int, header_parts[1:6])
         if l != 0:
             raise AIGParseError("Latches not supported (L must be 0).")
+        if len(lines) < pos + i + o + a:
+            raise AIGParseError("Truncated AAG body")
 
         self._literal_to_label[0] = self._get_or_create_false()
         self._literal_to_label[1] = self._get_or_create_true()
 
         input_literals: list[int] = []
         for idx in range(i):
-            lit = int(stream.readline().strip())
+            lit = int(lines[pos])
+            pos += 1
             input_literals.append(lit)
-            label = f"i{idx}"
+            label = sys.intern(f"i{idx}")
             self._circuit._emplace_gate(label, gate.INPUT)
             self._literal_to_label[lit] = label
 
-        output_literals: list[int] = []
-        for _ in range(o):
-            output_literals.append(int(stream.readline().strip()))
-
-        and_gates: list[tuple[int, int, int]] = []
-        for _ in range(a):
-            parts = stream.readline().strip().split()
-            lhs, rhs0, rhs1 = map(int, parts)
-            and_gates.append((lhs, rhs0, rhs1))
-            self._literal_to_label[lhs] = f"n{lhs // 2}"
+        output_literals = [int(line) for line in lines[pos:pos + o]]
+        pos += o
+
+        # Tokenize the whole AND block with one split instead of one
+        # readline/split/map per gate.
+        and_tokens = ' '.join(lines[pos:pos + a]).split()
+        pos += a
+        if len(and_tokens) != 3 * a:
+            raise AIGParseError(
+                f"Expected {3 * a} AND-gate fields, got {len(and_tokens)}"
+            )
+        token_iter = iter(map(int, and_tokens))
+        and_gates = list(zip(token_iter, token_iter, token_iter))
+        intern = sys.intern
+        self._literal_to_label.update(
+            (lhs, intern("n%d" % (lhs >> 1))) for lhs, _, _ in and_gates
+        )
 
         self._create_and_gates_topological(and_gates)
 
-        for line in stream:
+        for line in lines[pos:]:
             line = line.strip()
             if not line or line.startswith('c'):
                 break
@@ -101,21 +187,19 @@ class AIGParser:
 
     # ----- Binary format -----
 
-    def _parse_binary(self, stream, *, strict_header: bool = True) -> Circuit:
+    def _parse_binary(self, data, *, strict_header: bool = True) -> Circuit:
         self._circuit = Circuit()
         self._literal_to_label = {}
+        self._not_of = {}
         self._symbols = {'i': {}, 'o': {}, 'l': {}}
 
-        header_line = b''
-        while True:
-            ch = stream.read(1)
-            if ch == b'\n':
-                break
-            if not ch:
-                raise AIGParseError("Unexpected EOF in header")
-            header_line += ch
+        pos = 0
 
-        header_str = header_line.decode('ascii').strip()
+        nl = data.find(b'\n', pos)
+        if nl == -1:
+            raise AIGParseError("Unexpected EOF in header")
+        header_str = data[pos:nl].decode('ascii').strip()
+        pos = nl + 1
         header_parts = header_str.split()
         valid_headers = ['aig'] if strict_header else ['aag', 'aig']
         if len(header_parts) < 6 or header_parts[0] not in valid_headers:
@@ -132,32 +216,45 @@ class AIGParser:
         for idx in range(i):
             lit = 2 * (idx + 1)
             input_literals.append(lit)
-            label = f"i{idx}"
+            label = sys.intern(f"i{idx}")
             self._circuit._emplace_gate(label, gate.INPUT)
             self._literal_to_label[lit] = label
 
         output_literals: list[int] = []
         for _ in range(o):
-            line = b''
-            while True:
-                ch = stream.read(1)
-                if ch == b'\n':
-                    break
-                if not ch:
-                    raise AIGParseError("Unexpected EOF in outputs")
-                line += ch
-            output_literals.append(int(line.decode('ascii').strip()))
-
-        for idx in range(a):
-            lhs = 2 * (i + l + idx + 1)
-            delta0 = self._decode_binary_number(stream)
-            delta1 = self._decode_binary_number(stream)
-            rhs0 = lhs - delta0
-            rhs1 = rhs0 - delta1
-            self._add_and_gate(lhs, rhs0, rhs1)
+            nl = data.find(b'\n', pos)
+            if nl == -1:
+                raise AIGParseError("Unexpected EOF in outputs")
+            output_literals.append(int(data[pos:nl]))
+            pos = nl + 1
+
+        first_var = i + l + 1
+        triples, pos = _decode_and_body(data, pos, a, 2 * first_var)
+        # Binary lhs values are consecutive, so all labels can be built
+        # and registered up front in one sweep.
+        intern = sys.intern
+        labels = [intern("n%d" % var) for var in range(first_var, first_var + a)]
+        l2l = self._literal_to_label
+        l2l.update(zip(range(2 * first_var, 2 * (first_var + a), 2), labels))
+        # AND gates never touch _inputs, so write the gate and user tables
+        # directly instead of going through _emplace_gate per gate.
+        gates_dict = self._circuit._gates
+        users = self._circuit._gate_to_users
+        make_gate = gate.Gate
+        and_type = gate.AND
+        for and_label, (lhs, rhs0, rhs1) in zip(labels, triples):
+            op0 = l2l.get(rhs0)
+            if op0 is None:
+                op0 = self._get_literal_label(rhs0)
+            op1 = l2l.get(rhs1)
+            if op1 is None:
+                op1 = self._get_literal_label(rhs1)
+            gates_dict[and_label] = make_gate(and_label, and_type, (op0, op1))
+            users.setdefault(op0, []).append(and_label)
+            users.setdefault(op1, []).append(and_label)
 
         try:
-            remaining = stream.read()
+            remaining = data[pos:]
             if remaining:
                 text_part = remaining.decode('ascii', errors='ignore')
                 for text_line in text_part.split('\n'):
@@ -175,23 +272,8 @@ class AIGParser:
 
     # ----- Shared helpers -----
 
-    @staticmethod
-    def _decode_binary_number(stream) -> int:
-        result = 0
-        shift = 0
-        while True:
-            byte_data = stream.read(1)
-            if not byte_data:
-                raise AIGParseError("Unexpected EOF decoding number")
-            byte = byte_data[0]
-            result |= (byte & 0x7F) << shift
-            if (byte & 0x80) == 0:
-                break
-            shift += 7
-        return result
-
     def _add_and_gate(self, lhs: int, rhs0: int, rhs1: int) -> None:
-        and_label = f"n{lhs // 2}"
+        and_label = sys.intern(f"n{lhs // 2}")
         self._literal_to_label[lhs] = and_label
         self._add_and_gate_internal(lhs, rhs0, rhs1)
 
@@ -205,38 +287,94 @@ class AIGParser:
         self, and_gates: list[tuple[int, int, int]]
     ) -> None:
         lhs_set = {lhs for lhs, _, _ in and_gates}
-        gate_map = {lhs: (rhs0, rhs1) for lhs, rhs0, rhs1 in and_gates}
-        created: set[int] = set()
 
-        def create_gate(lhs: int) -> None:
-            if lhs in created:
-                return
-            rhs0, rhs1 = gate_map[lhs]
+        # AND lines in a spec-conforming AAG are already topologically
+        # sorted; check that with one linear scan and take the direct path.
+        seen: set[int] = set()
+        in_order = True
+        for lhs, rhs0, rhs1 in and_gates:
+            if any(
+                (rhs & ~1) in lhs_set and (rhs & ~1) not in seen
+                for rhs in (rhs0, rhs1)
+            ):
+                in_order = False
+                break
+            seen.add(lhs)
+
+        if in_order:
+            l2l = self._literal_to_label
+            gates_dict = self._circuit._gates
+            users = self._circuit._gate_to_users
+            make_gate = gate.Gate
+            and_type = gate.AND
+            for lhs, rhs0, rhs1 in and_gates:
+                op0 = l2l.get(rhs0)
+                if op0 is None:
+                    op0 = self._get_literal_label(rhs0)
+                op1 = l2l.get(rhs1)
+                if op1 is None:
+                    op1 = self._get_literal_label(rhs1)
+                and_label = l2l[lhs]
+                gates_dict[and_label] = make_gate(
+                    and_label, and_type, (op0, op1)
+                )
+                users.setdefault(op0, []).append(and_label)
+                users.setdefault(op1, []).append(and_label)
+            return
+
+        # Out-of-order definitions: iterative Kahn sweep (no recursion).
+        gate_map = {lhs: (rhs0, rhs1) for lhs, rhs0, rhs1 in and_gates}
+        indegree: dict[int, int] = {}
+        users: dict[int, list[int]] = collections.defaultdict(list)
+        for lhs, rhs0, rhs1 in and_gates:
+            degree = 0
             for rhs in (rhs0, rhs1):
                 base = rhs & ~1
-                if base in lhs_set and base not in created:
-                    create_gate(base)
+                if base in lhs_set:
+                    degree += 1
+                    users[base].append(lhs)
+            indegree[lhs] = degree
+
+        queue = collections.deque(
+            lhs for lhs, _, _ in and_gates if indegree[lhs] == 0
+        )
+        created = 0
+        while queue:
+            lhs = queue.popleft()
+            rhs0, rhs1 = gate_map[lhs]
             self._add_and_gate_internal(lhs, rhs0, rhs1)
-            created.add(lhs)
+            created += 1
+            for user in users[lhs]:
+                indegree[user] -= 1
+                if indegree[user] == 0:
+                    queue.append(user)
 
-        for lhs, _, _ in and_gates:
-            create_gate(lhs)
+        if created != len(and_gates):
+            raise AIGParseError("Cyclic AND-gate definitions")
 
     def _get_literal_label(self, literal: int) -> gate.Label:
         if literal in self._literal_to_label:
             return self._literal_to_label[literal]
         if literal % 2 == 1:
             base = literal - 1
-            if base not in self._literal_to_label:
-                raise AIGParseError(f"Undefined base literal {base}")
-            base_label = self._literal_to_label[base]
-            not_label = f"not_{base_label}"
-            if not_label not in self._circuit.gates:
-                self._circuit._emplace_gate(not_label, gate.NOT, (base_label,))
+            not_label = self._not_of.get(base)
+            if not_label is None:
+                not_label = self._make_not(base)
             self._literal_to_label[literal] = not_label
             return not_label
         raise AIGParseError(f"Undefined literal: {literal}")
 
+    def _make_not(self, base: int) -> gate.Label:
+        """Materialize (once) the shared NOT gate for an even literal."""
+        base_label = self._literal_to_label.get(base)
+        if base_label is None:
+            raise AIGParseError(f"Undefined base literal {base}")
+        not_label = sys.intern(f"not_{base_label}")
+        if not_label not in self._circuit.gates:
+            self._circuit._emplace_gate(not_label, gate.NOT, (base_label,))
+        self._not_of[base] = not_label
+        return not_label
+
     def _get_or_create_false(self) -> gate.Label:
         label = "__false__"
         if label not in self._circuit.gates:
@@ -250,32 +388,35 @@ class AIGParser:
         return label
 
     def _parse_symbol(self, line: str) -> None:
-        if len(line) < 2:
+        # Callers guarantee line[0] in 'ilo' and len(line) > 1; isdigit
+        # validates the index without try/except as control flow.
+        head, sep, name = line[1:].partition(' ')
+        if not sep or not head.isdigit():
             return
-        sym_type = line[0]
-        rest = line[1:]
-        space_idx = rest.find(' ')
-        if space_idx == -1:
-            return
-        try:
-            pos = int(rest[:space_idx])
-            name = rest[space_idx + 1:]
-            self._symbols[sym_type][pos] = name
-        except ValueError:
-            pass
+        self._symbols[line[0]][int(head)] = name
 
     def _apply_symbols(
         self, input_literals: list[int], output_literals: list[int]
     ) -> None:
+        if not self._symbols['i']:
+            return
+        # Reverse index built once; _rename_gate keeps it up to date so
+        # renames touch only the affected literals and fan-out gates.
+        reverse: dict[gate.Label, list[int]] = {}
+        for lit, lbl in self._literal_to_label.items():
+            reverse.setdefault(lbl, []).append(lit)
         for idx, lit in enumerate(input_literals):
             if idx in self._symbols['i']:
                 old_label = self._literal_to_label[lit]
                 new_label = self._symbols['i'][idx]
                 if old_label != new_label and old_label in self._circuit.gates:
-                    self._rename_gate(old_label, new_label, lit)
+                    self._rename_gate(old_label, new_label, reverse)
 
     def _rename_gate(
-        self, old_label: gate.Label, new_label: gate.Label, literal: int
+        self,
+        old_label: gate.Label,
+        new_label: gate.Label,
+        reverse: dict[gate.Label, list[int]],
     ) -> None:
         if new_label in self._circuit.gates:
             return
@@ -283,52 +424,50 @@ class AIGParser:
         old_not = f"not_{old_label}"
         new_not = f"not_{new_label}"
 
-        if old_not in self._circuit.gates:
+        had_not = old_not in self._circuit.gates
+        not_users: list[gate.Label] = []
+        if had_not:
             del self._circuit._gates[old_not]
-            if old_not in self._circuit._gate_to_users:
-                del self._circuit._gate_to_users[old_not]
-            for lit, lbl in list(self._literal_to_label.items()):
-                if lbl == old_not:
-                    self._literal_to_label[lit] = new_not
+            not_users = self._circuit._gate_to_users.pop(old_not, [])
+            for lit in reverse.pop(old_not, []):
+                self._literal_to_label[lit] = new_not
+                reverse.setdefault(new_not, []).append(lit)
 
+        old_users = self._circuit._gate_to_users.pop(old_label, [])
         del self._circuit._gates[old_label]
         if old_label in self._circuit._inputs:
             self._circuit._inputs.remove(old_label)
-        if old_label in self._circuit._gate_to_users:
-            del self._circuit._gate_to_users[old_label]
 
         self._circuit._emplace_gate(
             new_label, old_gate.gate_type, old_gate.operands
         )
-        self._literal_to_label[literal] = new_label
-
-        for lit, lbl in list(self._literal_to_label.items()):
-            if lbl == new_not and new_not not in self._circuit.gates:
-                self._circuit._emplace_gate(new_not, gate.NOT, (new_label,))
-                break
-
-        for gate_label, g in list(self._circuit._gates.items()):
-            new_ops = []
-            changed = False
-            for op in g.operands:
-                if op == old_label:
-                    new_ops.append(new_label)
-                    changed = True
-                elif op == old_not:
-                    new_ops.append(new_not)
-                    changed = True
-                else:
-                    new_ops.append(op)
-            if changed:
-                self._circuit._gates[gate_label] = gate.Gate(
-                    gate_label, g.gate_type, tuple(new_ops)
-                )
-                for nl in (new_label, new_not):
-                    if nl in new_ops:
-                        if nl not in self._circuit._gate_to_users:
-                            self._circuit._gate_to_users[nl] = []
-                        if gate_label not in self._circuit._gate_to_users[nl]:
-                            self._circuit._gate_to_users[nl].append(gate_label)
+        for lit in reverse.pop(old_label, []):
+            self._literal_to_label[lit] = new_label
+            reverse.setdefault(new_label, []).append(lit)
+
+        if had_not:
+            self._circuit._emplace_gate(new_not, gate.NOT, (new_label,))
+
+        for user_label, old_op, new_op in (
+            [(u, old_label, new_label) for u in old_users]
+            + [(u, old_not, new_not) for u in not_users]
+        ):
+            g = self._circuit._gates.get(user_label)
+            if g is None:
+                continue
+            new_ops = tuple(
+                new_op if op == old_op else op for op in g.operands
+            )
+            self._circuit._gates[user_label] = gate.Gate(
+                user_label, g.gate_type, new_ops
+            )
+            # Unconditional append: the old user list carries one entry per
+            # operand occurrence, so copying entries 1:1 preserves the same
+            # multiplicity _emplace_gate maintains — no O(fan-out)
+            # membership test needed.
+            self._circuit._gate_to_users.setdefault(new_op, []).append(
+                user_label
+            )
 
     def _set_outputs(self, output_literals: list[int]) -> None:
         output_labels: list[gate.Label] = []
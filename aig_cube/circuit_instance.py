@@ -1,11 +1,11 @@
+import copy
 import enum
 from dataclasses import dataclass
 
-from cirbo.core.circuit import Circuit, INPUT, Transformer
+from cirbo.core.circuit import Circuit, INPUT
 from cirbo.core.circuit.gate import NOT, AND, ALWAYS_FALSE, ALWAYS_TRUE, Gate
 
-from aig_cube.cnf import Cnf, tseytin_transformation
-from aig_cube.remove_constant_gates import RemoveConstantGates
+from aig_cube.cnf import Cnf, tseytin_transformation_cached
 
 
 class AssignmentStatus(enum.Enum):
@@ -13,7 +13,29 @@ class AssignmentStatus(enum.Enum):
     CONFLICT = "CONFLICT"
 
 
-@dataclass
+def _discard(_entry) -> None:
+    """Sink for CNF/assumption writes during lookahead probes."""
+
+
+def clone_circuit(circuit: Circuit) -> Circuit:
+    """Cheap structural clone of *circuit*.
+
+    This pipeline never mutates Gate objects — it replaces them — so only
+    the containers need duplicating: O(|C|) pointer copies instead of the
+    full object-graph walk `copy.deepcopy` does.
+    """
+    clone = copy.copy(circuit)
+    clone._gates = dict(circuit._gates)
+    clone._gate_to_users = {
+        label: list(users)
+        for label, users in circuit._gate_to_users.items()
+    }
+    clone._inputs = list(circuit._inputs)
+    clone._outputs = list(circuit._outputs)
+    return clone
+
+
+@dataclass(slots=True)
 class GateConfig:
     label: str
     idx: int
@@ -24,11 +46,37 @@ class GateConfig:
 class CircuitSatInstance:
     """A mutable (circuit, CNF) pair used during cubing."""
 
+    __slots__ = (
+        'circuit',
+        'cnf',
+        'gates_config',
+        'assumptions',
+        'dirty_labels',
+        '_pending_constants',
+        '_journal',
+    )
+
+    #: Validate gate types/arities on construction. The parser and the
+    #: cube-stage transformers already guarantee a well-formed AIG, so the
+    #: O(|C|) scan is skipped in optimized (-O) runs.
+    STRICT = __debug__
+
     def __init__(self, circuit: Circuit):
         self.circuit = circuit
         self._check_circuit()
+        self._pending_constants: list[str] = []
+        # Mutation log backing snapshot()/rollback(): every in-place edit
+        # made by assign/simplify appends an undo record here.
+        self._journal: list[tuple] = []
+        # Labels whose structure (type, operands or fan-out) changed since
+        # this set was last cleared; the solver's incremental candidate
+        # ranking rescores exactly these gates.
+        self.dirty_labels: set[str] = set()
+        # Unit literals fixed by assignments; a cube is fully described by
+        # the base CNF plus these, so they double as solver assumptions.
+        self.assumptions: list[int] = []
         self.gates_config: dict[str, GateConfig] = {}
-        self.cnf = tseytin_transformation(self.circuit)
+        self.cnf = tseytin_transformation_cached(self.circuit)
         for label in self.circuit.gates:
             gate_idx = self.cnf.get_var(label)
             is_input = self.circuit.get_gate(label).gate_type == INPUT
@@ -47,24 +95,210 @@ class CircuitSatInstance:
         return instance
 
     def simplify(self) -> None:
-        """Propagate constants through the AIG (output-direction, Table 1)."""
-        self.circuit = Transformer.apply_transformers(
-            self.circuit, [RemoveConstantGates()]
-        )
+        """Propagate constants through the AIG (output-direction, Table 1).
+
+        Folds the constants created by the last propagation into their
+        fan-out in place — same result as running RemoveConstantGates over
+        the whole circuit, but O(affected fan-out) instead of O(|C|).
+        """
+        circuit = self.circuit
+        gates = circuit._gates
+        users_map = circuit._gate_to_users
+        log = self._log
+        work = self._pending_constants
+        while work:
+            label = work.pop()
+            g = gates.get(label)
+            if g is None or g.gate_type not in (ALWAYS_TRUE, ALWAYS_FALSE):
+                continue
+            const_val = g.gate_type == ALWAYS_TRUE
+            label_users = users_map.pop(label, None)
+            if label_users is not None:
+                log(('users_popped', label, label_users))
+            for user in label_users or ():
+                user_gate = gates.get(user)
+                if user_gate is None or user_gate.gate_type in (
+                    ALWAYS_TRUE,
+                    ALWAYS_FALSE,
+                ):
+                    continue
+
+                if user_gate.gate_type == NOT:
+                    log(('gate', user, user_gate))
+                    gates[user] = Gate(
+                        label=user,
+                        gate_type=ALWAYS_FALSE if const_val else ALWAYS_TRUE,
+                        operands=(),
+                    )
+                    work.append(user)
+                    continue
+
+                # AND with at least one constant operand.
+                op0, op1 = user_gate.operands
+                other = op1 if op0 == label else op0
+                other_gate = gates[other]
+                if other == label or other_gate.gate_type in (
+                    ALWAYS_TRUE,
+                    ALWAYS_FALSE,
+                ):
+                    other_val = (
+                        const_val
+                        if other == label
+                        else other_gate.gate_type == ALWAYS_TRUE
+                    )
+                    self._journaled_remove_user(other, user)
+                    log(('gate', user, user_gate))
+                    gates[user] = Gate(
+                        label=user,
+                        gate_type=(
+                            ALWAYS_TRUE
+                            if const_val and other_val
+                            else ALWAYS_FALSE
+                        ),
+                        operands=(),
+                    )
+                    work.append(user)
+                elif not const_val:
+                    self._journaled_remove_user(other, user)
+                    log(('gate', user, user_gate))
+                    gates[user] = Gate(
+                        label=user, gate_type=ALWAYS_FALSE, operands=()
+                    )
+                    work.append(user)
+                else:
+                    # AND(True, other) == other: re-point the fan-out of
+                    # *user* to *other* and drop *user*.
+                    self._journaled_remove_user(other, user)
+                    user_users = users_map.pop(user, None)
+                    if user_users is not None:
+                        log(('users_popped', user, user_users))
+                    for uu in user_users or ():
+                        uu_gate = gates[uu]
+                        log(('gate', uu, uu_gate))
+                        gates[uu] = Gate(
+                            label=uu,
+                            gate_type=uu_gate.gate_type,
+                            operands=tuple(
+                                other if op == user else op
+                                for op in uu_gate.operands
+                            ),
+                        )
+                    if user_users:
+                        users_map.setdefault(other, []).extend(user_users)
+                        log(('users_extended', other, len(user_users)))
+                    log(('gate', user, user_gate))
+                    del gates[user]
+                    if user in circuit._outputs:
+                        log(('outputs', circuit._outputs))
+                        circuit._outputs = [
+                            other if out == user else out
+                            for out in circuit._outputs
+                        ]
+            log(('gate', label, g))
+            del gates[label]
+            if label in circuit._outputs:
+                log(('outputs', circuit._outputs))
+                circuit._outputs = [
+                    out for out in circuit._outputs if out != label
+                ]
 
-    def assign(self, label: str, value: bool) -> AssignmentStatus:
-        """Assign *value* to gate *label* and propagate (Section 3.3)."""
-        status = self._assign_and_propagate(label, value)
+    def assign(
+        self, label: str, value: bool, probe: bool = False
+    ) -> AssignmentStatus:
+        """Assign *value* to gate *label* and propagate (Section 3.3).
+
+        With ``probe=True`` the CNF and assumption logs are left untouched:
+        lookahead probes only observe the circuit-size delta and are rolled
+        back wholesale, so writing (and then truncating) unit clauses for
+        them is pure overhead.
+        """
+        status = self._assign_and_propagate(label, value, probe)
         if status != AssignmentStatus.OK:
             return status
         self.simplify()
         return AssignmentStatus.OK
 
+    def copy(self) -> "CircuitSatInstance":
+        """Detach a standalone copy of this instance.
+
+        Clause tuples, Gate objects and the variable map are never mutated
+        by this pipeline, so only the containers holding them are
+        duplicated — O(|C|) pointer copies instead of a deep copy of the
+        whole object graph. The copy starts with an empty journal; it does
+        not share undo state with its source.
+        """
+        clone = type(self).__new__(type(self))
+        clone.circuit = clone_circuit(self.circuit)
+        clone.cnf = Cnf(list(self.cnf.get_raw()), self.cnf.var_map)
+        clone.assumptions = list(self.assumptions)
+        clone.gates_config = {
+            label: GateConfig(
+                label=gc.label,
+                idx=gc.idx,
+                is_input=gc.is_input,
+                value=gc.value,
+            )
+            for label, gc in self.gates_config.items()
+        }
+        clone._pending_constants = list(self._pending_constants)
+        clone._journal = []
+        clone.dirty_labels = set()
+        return clone
+
+    def snapshot(self) -> tuple[int, int, int, int]:
+        """Capture the current state as an opaque token for `rollback`."""
+        return (
+            len(self._journal),
+            len(self.cnf.get_raw()),
+            len(self.assumptions),
+            len(self._pending_constants),
+        )
+
+    def rollback(self, token: tuple[int, int, int, int]) -> None:
+        """Undo every mutation made since the matching `snapshot` call.
+
+        Replays the journal in reverse, restoring replaced/deleted gates,
+        user lists, input/output lists and input values, then truncates the
+        append-only CNF/assumption logs. Cost is O(mutations), so trial
+        assignments during cubing need no deep copy.
+        """
+        journal_len, cnf_len, assumptions_len, pending_len = token
+        journal = self._journal
+        circuit = self.circuit
+        gates = circuit._gates
+        users_map = circuit._gate_to_users
+        mark_dirty = self._mark_dirty
+        while len(journal) > journal_len:
+            entry = journal.pop()
+            mark_dirty(entry)
+            kind = entry[0]
+            if kind == 'gate':
+                gates[entry[1]] = entry[2]
+            elif kind == 'user_removed':
+                users_map[entry[1]].insert(entry[3], entry[2])
+            elif kind == 'users_popped':
+                users_map[entry[1]] = entry[2]
+            elif kind == 'users_extended':
+                lst = users_map[entry[1]]
+                del lst[len(lst) - entry[2]:]
+            elif kind == 'input_removed':
+                circuit._inputs.insert(entry[2], entry[1])
+            elif kind == 'outputs':
+                circuit._outputs = entry[1]
+            else:
+                assert kind == 'input_value'
+                entry[1].value = entry[2]
+        del self.cnf.get_raw()[cnf_len:]
+        del self.assumptions[assumptions_len:]
+        del self._pending_constants[pending_len:]
+
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
     def _check_circuit(self) -> None:
+        if not self.STRICT:
+            return
         for g in self.circuit.gates.values():
             if g.gate_type == INPUT:
                 continue
@@ -84,53 +318,114 @@ class CircuitSatInstance:
                 f"Gate {g.label} has unsupported type {g.gate_type.name}"
             )
 
+    def _log(self, entry: tuple) -> None:
+        self._journal.append(entry)
+        self._mark_dirty(entry)
+
+    def _mark_dirty(self, entry: tuple) -> None:
+        """Flag the labels whose score a journal entry may invalidate.
+
+        A gate's score depends on its own definition, its user list, and —
+        because scoring looks through NOT gates — the user lists of its NOT
+        users; a fan-out change on a NOT therefore also dirties its operand.
+        """
+        kind = entry[0]
+        if kind in ('gate', 'input_removed'):
+            self.dirty_labels.add(entry[1])
+        elif kind in ('user_removed', 'users_popped', 'users_extended'):
+            label = entry[1]
+            self.dirty_labels.add(label)
+            g = self.circuit._gates.get(label)
+            if g is not None and g.gate_type == NOT:
+                self.dirty_labels.add(g.operands[0])
+        # 'outputs' and 'input_value' entries do not affect scores.
+
+    def _journaled_remove_user(self, gate_label: str, user: str) -> None:
+        """`Circuit._remove_user` with an undo record for `rollback`."""
+        users = self.circuit._gate_to_users.get(gate_label)
+        if users is None:
+            return
+        try:
+            idx = users.index(user)
+        except ValueError:
+            return
+        self._log(('user_removed', gate_label, user, idx))
+        del users[idx]
+
     def _assign_and_propagate(
-        self, label: str, value: bool
+        self, label: str, value: bool, probe: bool = False
     ) -> AssignmentStatus:
-        gate = self.circuit.get_gate(label)
-
-        if gate.gate_type in (ALWAYS_TRUE, ALWAYS_FALSE):
-            if gate.operator() != value:
-                return AssignmentStatus.CONFLICT
-            return AssignmentStatus.OK
-
-        lit = self.gates_config[label].idx
-        self.cnf.add_clause([lit if value else -lit])
-
-        if gate.gate_type == INPUT:
-            inputs_to_true: list[str] = []
-            inputs_to_false: list[str] = []
-            (inputs_to_true if value else inputs_to_false).append(label)
-            self.circuit = self.circuit.replace_inputs(
-                inputs_to_true, inputs_to_false
+        circuit = self.circuit
+        gates = circuit._gates
+        log = self._log
+        gates_config = self.gates_config
+        if probe:
+            add_clause = assumption = _discard
+        else:
+            add_clause = self.cnf.add_clause
+            assumption = self.assumptions.append
+        pending = self._pending_constants.append
+        # Explicit worklist instead of recursion: NOT/AND chains can be as
+        # deep as the circuit and would otherwise need recursion frames.
+        work: list[tuple[str, bool]] = [(label, value)]
+        while work:
+            label, value = work.pop()
+            gate = gates[label]
+            gate_type = gate.gate_type
+
+            if gate_type == ALWAYS_TRUE or gate_type == ALWAYS_FALSE:
+                if (gate_type == ALWAYS_TRUE) != value:
+                    return AssignmentStatus.CONFLICT
+                continue
+
+            lit = gates_config[label].idx
+            unit = lit if value else -lit
+            add_clause((unit,))
+            assumption(unit)
+
+            if gate_type == INPUT:
+                gc = gates_config[label]
+                log(('input_value', gc, gc.value))
+                gc.value = value
+                log(('gate', label, gate))
+                gates[label] = Gate(
+                    label=label,
+                    gate_type=ALWAYS_TRUE if value else ALWAYS_FALSE,
+                    operands=(),
+                )
+                idx = circuit._inputs.index(label)
+                log(('input_removed', label, idx))
+                del circuit._inputs[idx]
+                pending(label)
+                continue
+
+            operands = gate.operands
+            for operand in operands:
+                self._journaled_remove_user(operand, label)
+
+            log(('gate', label, gate))
+            gates[label] = Gate(
+                label=label,
+                gate_type=ALWAYS_TRUE if value else ALWAYS_FALSE,
+                operands=(),
             )
-            self.gates_config[label].value = value
-            return AssignmentStatus.OK
-
-        for operand in gate.operands:
-            self.circuit._remove_user(gate_label=operand, user=label)
-
-        new_gate_type = ALWAYS_TRUE if value else ALWAYS_FALSE
-        new_gate = Gate(label=label, gate_type=new_gate_type, operands=())
-        self.circuit._gates[label] = new_gate
-
-        if gate.gate_type == NOT:
-            return self._assign_and_propagate(gate.operands[0], not value)
-
-        if gate.gate_type == AND and value:
-            for operand_label in gate.operands:
-                status = self._assign_and_propagate(operand_label, True)
-                if status != AssignmentStatus.OK:
-                    return status
-            return AssignmentStatus.OK
-
-        if gate.gate_type == AND and not value:
-            assert len(gate.operands) == 2
-            lit0 = self.gates_config[gate.operands[0]].idx
-            lit1 = self.gates_config[gate.operands[1]].idx
-            self.cnf.add_clause([-lit0, -lit1])
-            return AssignmentStatus.OK
-
-        raise RuntimeError(
-            f"Propagation error: unsupported gate type {gate.gate_type}"
-        )
+            pending(label)
+
+            if gate_type == NOT:
+                work.append((operands[0], not value))
+                continue
+
+            if gate_type == AND:
+                if value:
+                    work.append((operands[0], True))
+                    work.append((operands[1], True))
+                else:
+                    lit0 = gates_config[operands[0]].idx
+                    lit1 = gates_config[operands[1]].idx
+                    add_clause((-lit0, -lit1))
+                continue
+
+            raise RuntimeError(
+                f"Propagation error: unsupported gate type {gate_type}"
+            )
+        return AssignmentStatus.OK
@@ -1,17 +1,18 @@
-import collections
-
 from cirbo.core.circuit import (
     ALWAYS_FALSE,
     ALWAYS_TRUE,
     AND,
     Circuit,
+    Gate,
     GateType,
     INPUT,
     NOT,
 )
 
 Lit = int
-Clause = list[Lit]
+# Clauses are stored as tuples: immutable, smaller, and cheaper to build
+# than lists in the encoding hot loop.
+Clause = tuple[Lit, ...]
 CnfRaw = list[Clause]
 VarMap = dict[str, Lit]
 
@@ -19,6 +20,8 @@ VarMap = dict[str, Lit]
 class Cnf:
     """CNF formula with gate-label-to-variable mapping."""
 
+    __slots__ = ('_cnf', '_var_map')
+
     def __init__(
         self,
         cnf: CnfRaw | None = None,
@@ -41,63 +44,131 @@ class Cnf:
         return self._var_map.get(label)
 
 
+#: Bounded memo for `tseytin_transformation` keyed by circuit structure,
+#: so repeated solves over structurally identical circuits skip the
+#: encoding traversal. Evicted FIFO once full.
+_TSEYTIN_CACHE: dict[tuple, tuple[CnfRaw, VarMap]] = {}
+_TSEYTIN_CACHE_LIMIT = 64
+
+
+def _structural_key(circuit: Circuit) -> tuple:
+    gates = tuple(
+        (label, g.gate_type, g.operands)
+        for label, g in circuit.gates.items()
+    )
+    return (gates, tuple(circuit.outputs))
+
+
+def tseytin_transformation_cached(circuit: Circuit) -> Cnf:
+    """`tseytin_transformation` memoized on the circuit's structure.
+
+    Cached clause lists are never handed out directly — callers append
+    their own unit clauses — so a hit returns a fresh `Cnf` over a copied
+    clause list; the variable map is read-only and shared.
+    """
+    key = _structural_key(circuit)
+    hit = _TSEYTIN_CACHE.get(key)
+    if hit is not None:
+        raw, var_map = hit
+        return Cnf(list(raw), var_map)
+    cnf = tseytin_transformation(circuit)
+    if len(_TSEYTIN_CACHE) >= _TSEYTIN_CACHE_LIMIT:
+        _TSEYTIN_CACHE.pop(next(iter(_TSEYTIN_CACHE)))
+    _TSEYTIN_CACHE[key] = (list(cnf.get_raw()), cnf.var_map)
+    return cnf
+
+
+def _encode_and(top: Lit, lits: list[Lit], append) -> None:
+    if len(lits) == 2:
+        lit0, lit1 = lits
+        append((lit0, -top))
+        append((lit1, -top))
+        append((-lit0, -lit1, top))
+        return
+    common = [top]
+    for lit in lits:
+        common.append(-lit)
+        append((lit, -top))
+    append(tuple(common))
+
+
+def _encode_not(top: Lit, lits: list[Lit], append) -> None:
+    lit0 = lits[0]
+    append((lit0, top))
+    append((-lit0, -top))
+
+
+def _encode_input(top: Lit, lits: list[Lit], append) -> None:
+    pass
+
+
+def _encode_true(top: Lit, lits: list[Lit], append) -> None:
+    append((top,))
+
+
+def _encode_false(top: Lit, lits: list[Lit], append) -> None:
+    append((-top,))
+
+
+#: Per-gate-type clause emitters, looked up once per gate in the encoding
+#: loop instead of walking an if/elif chain.
+_GATE_ENCODERS: dict[GateType, object] = {
+    AND: _encode_and,
+    NOT: _encode_not,
+    INPUT: _encode_input,
+    ALWAYS_TRUE: _encode_true,
+    ALWAYS_FALSE: _encode_false,
+}
+
+
 def tseytin_transformation(circuit: Circuit) -> Cnf:
     """Convert an AIG circuit to CNF via Tseytin encoding (iterative)."""
     next_lit = 0
-
-    def _new_lit() -> Lit:
-        nonlocal next_lit
-        next_lit += 1
-        return next_lit
-
-    saved_lits: dict[str, Lit] = collections.defaultdict(_new_lit)
+    saved_lits: dict[str, Lit] = {}
 
     for input_label in circuit.inputs:
-        _ = saved_lits[input_label]
+        next_lit += 1
+        saved_lits[input_label] = next_lit
 
     cnf: CnfRaw = []
 
     def _process_all(root: str) -> Lit:
         """Iterative post-order traversal to encode all gates reachable from *root*."""
-        stack: list[tuple[str, bool]] = [(root, False)]
+        nonlocal next_lit
+        get_gate = circuit.get_gate
+        append = cnf.append
+        encoders = _GATE_ENCODERS
+        # The gate fetched on the expand pass rides along on the stack so
+        # the encode pass does not have to look it up again.
+        stack: list[tuple[str, Gate | None]] = [(root, None)]
         while stack:
-            label, expanded = stack.pop()
-            if label in saved_lits:
-                continue
-            if not expanded:
-                gate = circuit.get_gate(label)
-                stack.append((label, True))
+            label, gate = stack.pop()
+            if gate is None:
+                if label in saved_lits:
+                    continue
+                gate = get_gate(label)
+                stack.append((label, gate))
                 for op in reversed(gate.operands):
                     if op not in saved_lits:
-                        stack.append((op, False))
+                        stack.append((op, None))
+                continue
+            if label in saved_lits:
                 continue
-            gate = circuit.get_gate(label)
             lits = [saved_lits[op] for op in gate.operands]
-            top = saved_lits[label]
-
-            if gate.gate_type == INPUT:
-                pass
-            elif gate.gate_type == ALWAYS_TRUE:
-                cnf.append([top])
-            elif gate.gate_type == ALWAYS_FALSE:
-                cnf.append([-top])
-            elif gate.gate_type == NOT:
-                cnf.append([lits[0], top])
-                cnf.append([-lits[0], -top])
-            elif gate.gate_type == AND:
-                common = [top]
-                for lit in lits:
-                    common.append(-lit)
-                    cnf.append([lit, -top])
-                cnf.append(common)
-            else:
+            next_lit += 1
+            top = saved_lits[label] = next_lit
+
+            encode = encoders.get(gate.gate_type)
+            if encode is None:
                 raise ValueError(
-                    f"Unsupported gate type: {gate.gate_type} for gate {label}"
+                    f"Unsupported gate type: {gate.gate_type} "
+                    f"for gate {label}"
                 )
+            encode(top, lits, append)
         return saved_lits[root]
 
     for i in range(circuit.output_size):
         out_lit = _process_all(circuit.output_at_index(i))
-        cnf.append([out_lit])
+        cnf.append((out_lit,))
 
-    return Cnf(cnf, var_map=dict(saved_lits))
+    return Cnf(cnf, var_map=saved_lits)
@@ -0,0 +1,50 @@
+import logging
+
+from cirbo.core.circuit import Circuit, gate
+from cirbo.core.circuit.transformer import Transformer
+
+__all__ = [
+    'FoldContradictions',
+]
+
+logger = logging.getLogger(__name__)
+
+
+class FoldContradictions(Transformer):
+    """Rewrite syntactic contradictions ``AND(x, NOT(x))`` to ALWAYS_FALSE.
+
+    A single O(|C|) pass over the gates; the constant-propagation
+    transformer that runs next folds the introduced constants through the
+    rest of the circuit, so a contradictory output is decided without the
+    SAT solver ever running.
+    """
+
+    __idempotent__: bool = True
+
+    def __init__(self):
+        super().__init__(post_transformers=())
+
+    def _transform(self, circuit: Circuit) -> Circuit:
+        gates = circuit.gates
+        new_circuit = Circuit()
+        folded = 0
+        for g in circuit.top_sort(inverse=True):
+            if g.gate_type == gate.AND and len(g.operands) == 2:
+                op0, op1 = g.operands
+                g0, g1 = gates[op0], gates[op1]
+                if (
+                    g0.gate_type == gate.NOT and g0.operands[0] == op1
+                ) or (
+                    g1.gate_type == gate.NOT and g1.operands[0] == op0
+                ):
+                    new_circuit.emplace_gate(
+                        g.label, gate.ALWAYS_FALSE, ()
+                    )
+                    folded += 1
+                    continue
+            new_circuit.emplace_gate(g.label, g.gate_type, g.operands)
+        if folded:
+            logger.info("Folded %d contradictory AND gates", folded)
+        new_circuit.set_inputs(list(circuit.inputs))
+        new_circuit.set_outputs(list(circuit.outputs))
+        return new_circuit
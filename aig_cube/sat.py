@@ -1,7 +1,6 @@
 import dataclasses
 import enum
 
-import pysat.formula
 import pysat.solvers
 
 from aig_cube.cnf import Cnf
@@ -32,6 +31,47 @@ class PySatResult:
     model: list[int] | None
 
 
+class IncrementalSolver:
+    """A PySAT solver kept alive across calls, solved under assumptions.
+
+    Bootstraps the CDCL backend with a base CNF once; each subsequent
+    `solve` only passes assumption literals, so learned clauses are
+    reused instead of rebuilding the solver per call.
+    """
+
+    __slots__ = ('_solver',)
+
+    def __init__(
+        self,
+        cnf: Cnf,
+        *,
+        solver_name: PySATSolverNames | str = PySATSolverNames.CADICAL195,
+    ):
+        solver_name = PySATSolverNames(solver_name)
+        self._solver = pysat.solvers.Solver(
+            name=solver_name.value, bootstrap_with=cnf.get_raw()
+        )
+
+    def solve(self, assumptions: list[int] | None = None) -> PySatResult:
+        answer = self._solver.solve(
+            assumptions=assumptions if assumptions is not None else []
+        )
+        return PySatResult(answer, self._solver.get_model())
+
+    def get_core(self) -> list[int] | None:
+        """Assumption literals the last UNSAT answer depended on."""
+        return self._solver.get_core()
+
+    def delete(self) -> None:
+        self._solver.delete()
+
+    def __enter__(self) -> "IncrementalSolver":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.delete()
+
+
 def is_satisfiable(
     cnf: Cnf,
     *,
@@ -39,7 +79,7 @@ def is_satisfiable(
 ) -> PySatResult:
     """Check CNF satisfiability with PySAT."""
     solver_name = PySATSolverNames(solver_name)
-    _pysat_cnf = pysat.formula.CNF(from_clauses=cnf.get_raw())
-    with pysat.solvers.Solver(name=solver_name.value) as _solver:
-        _solver.append_formula(_pysat_cnf)
+    with pysat.solvers.Solver(
+        name=solver_name.value, bootstrap_with=cnf.get_raw()
+    ) as _solver:
         return PySatResult(_solver.solve(), _solver.get_model())
@@ -1,19 +1,124 @@
-import copy
+import hashlib
+import heapq
 import logging
-import sys
+import os
+import pathlib
+import pickle
+import subprocess
+import tempfile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
+from typing import Iterator
 
 from cirbo.core.circuit import Circuit, Transformer
-from cirbo.core.circuit.gate import ALWAYS_TRUE, ALWAYS_FALSE, INPUT, AND, NOT
+from cirbo.core.circuit.gate import (
+    ALWAYS_TRUE,
+    ALWAYS_FALSE,
+    IFF,
+    INPUT,
+    AND,
+    NOT,
+    Gate,
+)
 from cirbo.minimization import MergeUnaryOperators
 
-from aig_cube.circuit_instance import CircuitSatInstance, AssignmentStatus
+from aig_cube.circuit_instance import (
+    AssignmentStatus,
+    CircuitSatInstance,
+    clone_circuit,
+)
+from aig_cube.cnf import Cnf
+from aig_cube.fold_contradictions import FoldContradictions
 from aig_cube.remove_constant_gates import RemoveConstantGates
-from aig_cube.sat import PySatResult, PySATSolverNames, is_satisfiable
+from aig_cube.sat import (
+    IncrementalSolver,
+    PySatResult,
+    PySATSolverNames,
+    is_satisfiable,
+)
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+#: Per-process incremental solver used by the parallel Conquer stage.
+_worker_solver: IncrementalSolver | None = None
+
+
+def _init_conquer_worker(raw_cnf, solver_name: str) -> None:
+    """Bootstrap one incremental solver in each worker process."""
+    global _worker_solver
+    _worker_solver = IncrementalSolver(Cnf(raw_cnf), solver_name=solver_name)
+
+
+def _conquer_worker_solve(assumptions: list[int]) -> PySatResult:
+    assert _worker_solver is not None
+    return _worker_solver.solve(assumptions=assumptions)
+
+
+def _output_truth_table(circuit: Circuit) -> int:
+    """Evaluate all 2^n input assignments of a single-output circuit.
+
+    Bit k of the result is the output under the assignment where input i
+    (in ``circuit.inputs`` order) takes bit i of k. Python's
+    arbitrary-width integers serve as the SIMD lanes: one bitwise
+    operation per gate covers every assignment at once.
+    """
+    n = circuit.input_size
+    lanes = 1 << n
+    full = (1 << lanes) - 1
+    vals: dict[str, int] = {}
+    for i, label in enumerate(circuit.inputs):
+        # Input i is bit i of the lane index: 2^i zero lanes then 2^i one
+        # lanes, repeated; built by doubling instead of per-lane work.
+        block = 1 << i
+        pattern = ((1 << block) - 1) << block
+        width = block * 2
+        while width < lanes:
+            pattern |= pattern << width
+            width *= 2
+        vals[label] = pattern
+    gates = circuit._gates
+    [root] = circuit.outputs
+    stack: list[tuple[str, Gate | None]] = [(root, None)]
+    while stack:
+        label, gate = stack.pop()
+        if gate is None:
+            if label in vals:
+                continue
+            gate = gates[label]
+            stack.append((label, gate))
+            for op in gate.operands:
+                if op not in vals:
+                    stack.append((op, None))
+            continue
+        if label in vals:
+            continue
+        gate_type = gate.gate_type
+        if gate_type == AND:
+            v = full
+            for op in gate.operands:
+                v &= vals[op]
+        elif gate_type == NOT:
+            v = vals[gate.operands[0]] ^ full
+        elif gate_type == IFF:
+            # The AIG parser wraps named outputs in identity gates; they
+            # pass the operand's lanes through unchanged.
+            v = vals[gate.operands[0]]
+        elif gate_type == ALWAYS_TRUE:
+            v = full
+        elif gate_type == ALWAYS_FALSE:
+            v = 0
+        else:
+            raise ValueError(
+                f"Unsupported gate type: {gate_type} for gate {label}"
+            )
+        vals[label] = v
+    return vals[root]
+
+@dataclass(slots=True)
 class _GateWeightResult:
     weight: int | None = None
     forced_value: bool | None = None
@@ -23,7 +128,7 @@ class _GateWeightResult:
         return self.forced_value is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class _CubeGateSelection:
     label: str
     forced_value: bool | None = None
@@ -45,41 +150,171 @@ class CubeAndConquerSolver:
         (Stage 2 of gate selection).  Default is 10.
     solver_name : PySATSolverNames
         PySAT solver used in the Conquer stage.
+    conquer_workers : int | None
+        Worker processes for the Conquer stage. ``None`` (the default)
+        uses ``os.cpu_count()``; ``1`` solves cubes serially in-process.
+    cube_backend : str
+        ``"native"`` (the default) runs the built-in lookahead cubing;
+        ``"march_cu"`` shells out to the march_cu lookahead solver on the
+        base CNF and rebuilds instances from the cubes it emits.
+    march_path : str
+        Path to the march_cu executable for ``cube_backend="march_cu"``.
+    cube_cache_dir : str | os.PathLike | None
+        When set, cube lists are cached on disk keyed by the base CNF and
+        the cubing parameters, so repeated runs over the same instance
+        (e.g. the benchmark suite) skip the deterministic cube stage.
+        Off by default.
     """
 
     DEFAULT_MAX_DEPTH = 4
     DEFAULT_CANDIDATES_LIMIT = 10
     DEFAULT_SOLVER_NAME = PySATSolverNames.CADICAL195
 
+    #: Circuits with at most this many inputs are decided by bit-parallel
+    #: exhaustive evaluation instead of cube-and-conquer: one bigint
+    #: bitwise op per gate covers all 2^n assignments, which beats cubing
+    #: plus CDCL by a wide margin at this size.
+    EXHAUSTIVE_INPUT_LIMIT = 10
+
     def __init__(
         self,
         max_depth: int = DEFAULT_MAX_DEPTH,
         candidates_limit: int = DEFAULT_CANDIDATES_LIMIT,
         solver_name: PySATSolverNames = DEFAULT_SOLVER_NAME,
+        conquer_workers: int | None = None,
+        cube_backend: str = "native",
+        march_path: str = "march_cu",
+        cube_cache_dir: "str | os.PathLike | None" = None,
     ):
+        if cube_backend not in ("native", "march_cu"):
+            raise ValueError(f"Unknown cube backend: {cube_backend!r}")
         self.max_depth = max_depth
         self.candidates_limit = candidates_limit
         self.solver_name = solver_name
+        self.conquer_workers = conquer_workers
+        self.cube_backend = cube_backend
+        self.march_path = march_path
+        self.cube_cache_dir = cube_cache_dir
         self._trivial_result: PySatResult | None = None
+        self._base_cnf: Cnf | None = None
+        self._scores: dict[str, int] | None = None
+        self._eval_circuit: Circuit | None = None
 
     def solve(self, circuit: Circuit) -> PySatResult:
-        """Run full Cube-and-Conquer (Algorithm 1)."""
-        sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 ** 6))
+        """Run full Cube-and-Conquer (Algorithm 1).
+
+        Multi-output circuits are satisfiable iff some output is, so they
+        are solved one output at a time with the first SAT answer
+        short-circuiting the rest.
+        """
+        if circuit.output_size > 1:
+            return self._solve_outputs(circuit)
         self._trivial_result = None
-        cubes = self.cube(circuit)
+        self._base_cnf = None
+        self._eval_circuit = None
+        result = self._solve_trivial_output(circuit)
+        if result is not None:
+            return result
+        if circuit.input_size <= self.EXHAUSTIVE_INPUT_LIMIT:
+            return self._solve_exhaustive(circuit)
+        cubes = []
+        for instance in self.iter_cubes(circuit):
+            if instance.circuit.input_size == 0:
+                # Propagation fixed every input, so this cube has exactly
+                # one candidate assignment: evaluating it decides the cube
+                # without CDCL. On SAT, close the tree early instead of
+                # generating the remaining siblings; on UNSAT, drop the
+                # refuted cube from the Conquer workload.
+                if self._cube_is_sat(instance):
+                    return PySatResult(
+                        answer=True, model=self._input_model(instance)
+                    )
+                continue
+            cubes.append(instance)
         if self._trivial_result is not None:
             return self._trivial_result
         result = self.conquer(cubes)
         return result
 
+    def _solve_outputs(self, circuit: Circuit) -> PySatResult:
+        """Solve each output as its own single-output instance.
+
+        Per-output instances shrink to just that output's cone under
+        preprocessing, so each solve sees a fraction of the circuit; a
+        falsifying output is found without ever encoding the others.
+        """
+        for out in circuit.outputs:
+            view = clone_circuit(circuit)
+            view._outputs = [out]
+            result = self.solve(view)
+            if result.answer:
+                return result
+        return PySatResult(answer=False, model=None)
+
+    @staticmethod
+    def _solve_trivial_output(circuit: Circuit) -> PySatResult | None:
+        """Fast path for degenerate outputs.
+
+        An output that is a constant gate or a bare input decides the
+        instance by inspection — no preprocessing, encoding or solving.
+        Returns None when the output is a real gate.
+        """
+        assert circuit.output_size == 1
+        out = circuit.outputs[0]
+        gate_type = circuit.get_gate(out).gate_type
+        if gate_type == ALWAYS_TRUE:
+            return PySatResult(answer=True, model=None)
+        if gate_type == ALWAYS_FALSE:
+            return PySatResult(answer=False, model=None)
+        if gate_type == INPUT:
+            idx = circuit.inputs.index(out) + 1
+            model = [-(i + 1) for i in range(circuit.input_size)]
+            model[idx - 1] = idx
+            return PySatResult(answer=True, model=model)
+        return None
+
+    def _solve_exhaustive(self, circuit: Circuit) -> PySatResult:
+        """Decide a small circuit from its full truth table."""
+        assert circuit.output_size == 1
+        table = _output_truth_table(circuit)
+        if table == 0:
+            return PySatResult(answer=False, model=None)
+        lane = (table & -table).bit_length() - 1
+        model = [
+            (i + 1) if lane >> i & 1 else -(i + 1)
+            for i in range(circuit.input_size)
+        ]
+        return PySatResult(answer=True, model=model)
+
     def cube(self, circuit: Circuit) -> list[CircuitSatInstance]:
-        """Cube stage: decompose *circuit* into sub-problems."""
+        """Cube stage: decompose *circuit* into sub-problems.
+
+        Materializes the full cube list; use `iter_cubes` when the leaves
+        should be consumed as a bounded-memory stream instead.
+        """
+        return list(self.iter_cubes(circuit))
+
+    def iter_cubes(self, circuit: Circuit) -> Iterator[CircuitSatInstance]:
+        """Cube stage as a stream: yield sub-problems while the tree is
+        still being explored, so callers can overlap conquering (or DIMACS
+        dumping) with cube generation instead of holding all 2^depth
+        leaves in memory first.
+
+        Preprocessing runs eagerly, so `_trivial_result` is valid as soon
+        as this returns.
+        """
         assert circuit.output_size == 1, (
             f"CnC solver expects a single-output circuit, got {circuit.output_size}"
         )
+        self._scores = None
         original_circuit = circuit
         circuit = Transformer.apply_transformers(
-            circuit, [RemoveConstantGates(), MergeUnaryOperators()]
+            circuit,
+            [
+                FoldContradictions(),
+                RemoveConstantGates(),
+                MergeUnaryOperators(),
+            ],
         )
         logger.info(
             "Cube stage: circuit has %d gates", circuit.size
@@ -92,72 +327,345 @@ class CubeAndConquerSolver:
                 is_true, "SAT" if is_true else "UNSAT",
             )
             self._trivial_result = PySatResult(answer=is_true, model=None)
-            return []
+            return iter(())
+        # Pristine copy of the branching circuit: instances mutate theirs
+        # in place, and deciding a fully-propagated cube needs evaluation
+        # against the unmodified structure.
+        self._eval_circuit = clone_circuit(circuit)
         instance = CircuitSatInstance.from_circuit(circuit)
 
         if instance is None:
-            return []
+            return iter(())
+
+        # Clauses are immutable tuples, so a shallow list copy freezes the
+        # pre-branching CNF shared by every cube.
+        self._base_cnf = Cnf(list(instance.cnf.get_raw()), instance.cnf.var_map)
 
         logger.info(
             "Instance: %d gates, %d clauses",
             instance.circuit.size,
             len(instance.cnf.get_raw()),
         )
-        return list(self._cube(instance))
+        if self.cube_cache_dir is not None:
+            return iter(self._cubes_cached(instance))
+        if self.cube_backend == "march_cu":
+            return self._cube_march(instance)
+        return self._cube(instance)
 
     def conquer(self, cubes: list[CircuitSatInstance]) -> PySatResult:
-        """Conquer stage: solve each sub-problem with CDCL."""
+        """Conquer stage: solve each sub-problem with CDCL.
+
+        When the pre-branching CNF is known (the normal path through
+        `solve`/`cube`), one incremental solver is bootstrapped with it and
+        each cube is solved under its assumption literals, reusing learned
+        clauses across cubes. Cubes passed in without that context fall
+        back to one solver per cube.
+
+        Cubes are independent sub-problems, so with more than one worker
+        available they are fanned out to a process pool; each worker keeps
+        its own bootstrapped incremental solver and the first SAT answer
+        cancels the cubes still waiting.
+        """
+        if self._base_cnf is not None:
+            # Broad cubes (few assumption literals) are cheapest to refute
+            # and seed the solver with the most widely applicable lemmas,
+            # so on UNSAT instances solving them first amplifies
+            # learned-clause reuse and core pruning for the constrained
+            # cubes that follow.
+            cubes = sorted(cubes, key=lambda c: len(c.assumptions))
+            workers = self.conquer_workers or os.cpu_count() or 1
+            workers = min(workers, len(cubes))
+            if workers > 1:
+                return self._conquer_parallel(cubes, workers)
+            with IncrementalSolver(
+                self._base_cnf, solver_name=self.solver_name
+            ) as solver:
+                # Cubes in the same subtree often fail for the same small
+                # reason; remembering the assumption cores of UNSAT cubes
+                # lets later cubes that contain one be refuted by a subset
+                # check instead of a CDCL run. Cores are kept sorted by
+                # size so the cheapest checks run first.
+                unsat_cores: list[frozenset[int]] = []
+                for instance in cubes:
+                    lits = frozenset(instance.assumptions)
+                    if any(core <= lits for core in unsat_cores):
+                        continue
+                    result = solver.solve(assumptions=instance.assumptions)
+                    if result.answer:
+                        return self._extract_model(instance, result)
+                    core = solver.get_core()
+                    if not core:
+                        # UNSAT without using any assumption: the base
+                        # CNF itself is contradictory, so every remaining
+                        # cube is too.
+                        break
+                    unsat_cores.append(frozenset(core))
+                    unsat_cores.sort(key=len)
+            return PySatResult(answer=False, model=None)
+
         for instance in cubes:
             result = is_satisfiable(
                 cnf=instance.cnf,
                 solver_name=self.solver_name,
             )
             if result.answer:
-                model: list[int] = [0] * len(instance.gates_config)
-                for gc in instance.gates_config.values():
-                    if not gc.is_input:
-                        continue
-                    assert result.model is not None
-                    model[gc.idx - 1] = gc.idx if gc.value else -gc.idx
-                return PySatResult(answer=True, model=model)
+                return self._extract_model(instance, result)
         return PySatResult(answer=False, model=None)
 
+    def _conquer_parallel(
+        self, cubes: list[CircuitSatInstance], workers: int
+    ) -> PySatResult:
+        """Fan cubes out to a worker pool, handing out work on demand.
+
+        Instead of submitting every cube up front, a bounded window of
+        in-flight futures is kept topped up as results come back, so an
+        early SAT answer leaves the bulk of the cube tree untouched and
+        the submission cost scales with cubes actually attempted rather
+        than with the full leaf count.
+        """
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_conquer_worker,
+            initargs=(self._base_cnf.get_raw(), self.solver_name.value),
+        )
+        cube_iter = iter(cubes)
+        pending: dict = {}
+
+        def submit_next() -> None:
+            for instance in cube_iter:
+                future = executor.submit(
+                    _conquer_worker_solve, instance.assumptions
+                )
+                pending[future] = instance
+                return
+
+        try:
+            for _ in range(workers * 2):
+                submit_next()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    instance = pending.pop(future)
+                    result = future.result()
+                    if result.answer:
+                        return self._extract_model(instance, result)
+                    submit_next()
+            return PySatResult(answer=False, model=None)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _cube_is_sat(self, instance: CircuitSatInstance) -> bool:
+        """Evaluate the single assignment of a fully-propagated cube.
+
+        Structural propagation is one-directional, so a contradiction can
+        survive in the CNF even when every input got a value; evaluating
+        the circuit on those inputs settles the cube exactly.
+        """
+        assert self._eval_circuit is not None
+        gates_config = instance.gates_config
+        values = [
+            bool(gates_config[label].value)
+            for label in self._eval_circuit.inputs
+        ]
+        return self._eval_circuit.evaluate(values)[0]
+
+    @staticmethod
+    def _input_model(instance: CircuitSatInstance) -> list[int]:
+        """Literal assignment of the inputs fixed by this cube."""
+        model: list[int] = [0] * len(instance.gates_config)
+        for gc in instance.gates_config.values():
+            if gc.is_input:
+                model[gc.idx - 1] = gc.idx if gc.value else -gc.idx
+        return model
+
+    @classmethod
+    def _extract_model(
+        cls, instance: CircuitSatInstance, result: PySatResult
+    ) -> PySatResult:
+        assert result.model is not None
+        return PySatResult(answer=True, model=cls._input_model(instance))
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
     def _cube(
-        self, instance: CircuitSatInstance, depth: int = 0
-    ) -> list[CircuitSatInstance]:
-        """Recursive cubing (Algorithm 2)."""
-        if self._should_stop(instance, depth):
-            logger.info(
-                "Leaf at depth %d: %d gates, %d clauses",
-                depth,
-                instance.circuit.size,
-                len(instance.cnf.get_raw()),
-            )
-            return [instance]
+        self, instance: CircuitSatInstance
+    ) -> Iterator[CircuitSatInstance]:
+        """Iterative cubing (Algorithm 2), yielding leaves as found.
+
+        Explicit DFS over operations instead of recursion: a 'node' entry
+        expands one tree node, a 'branch' entry performs one trial
+        assignment, and a 'rollback' entry — pushed beneath a branch's
+        subtree — undoes it once that subtree is exhausted. Both branches
+        reuse *instance* via snapshot/rollback; only leaf cubes are
+        materialized as copies (see _freeze).
+        """
+        stack: list[tuple] = [('node', 0)]
+        while stack:
+            op = stack.pop()
+            kind = op[0]
+
+            if kind == 'rollback':
+                instance.rollback(op[1])
+                continue
+
+            if kind == 'branch':
+                _, depth, label, value = op
+                token = instance.snapshot()
+                if instance.assign(label, value) == AssignmentStatus.OK:
+                    stack.append(('rollback', token))
+                    stack.append(('node', depth + 1))
+                else:
+                    # Refuted by propagation: no cubes from this branch.
+                    instance.rollback(token)
+                continue
+
+            depth = op[1]
+            if self._should_stop(instance, depth):
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Leaf at depth %d: %d gates, %d clauses",
+                        depth,
+                        instance.circuit.size,
+                        len(instance.cnf.get_raw()),
+                    )
+                yield self._freeze(instance)
+                continue
+
+            selection = self._select_gate(instance)
+            if selection is None:
+                yield self._freeze(instance)
+                continue
+
+            if selection.is_forced:
+                logger.debug(
+                    "Forced %s=%s (other branch conflicts)",
+                    selection.label,
+                    selection.forced_value,
+                )
+                status = instance.assign(
+                    selection.label, selection.forced_value
+                )
+                if status == AssignmentStatus.OK:
+                    stack.append(('node', depth + 1))
+                # else: both values conflict — subtree refuted.
+                continue
+
+            # False branch explored first, so push it last.
+            stack.append(('branch', depth, selection.label, True))
+            stack.append(('branch', depth, selection.label, False))
 
-        selection = self._select_gate(instance)
-        if selection is None:
-            return [instance]
+    @staticmethod
+    def _freeze(instance: CircuitSatInstance) -> CircuitSatInstance:
+        """Materialize *instance* as a standalone leaf cube."""
+        return instance.copy()
 
-        if selection.is_forced:
-            logger.debug(
-                "Forced %s=%s (other branch conflicts)",
-                selection.label,
-                selection.forced_value,
+    def _cubes_cached(
+        self, instance: CircuitSatInstance
+    ) -> list[CircuitSatInstance]:
+        """Cube with an on-disk cache in `cube_cache_dir`.
+
+        Cubing is deterministic in the base CNF and the cubing parameters,
+        so those form the cache key; a stale or unreadable entry just falls
+        back to recubing. Entries are written via a temp file + rename so a
+        crashed run never leaves a truncated pickle behind.
+        """
+        assert self._base_cnf is not None
+        key = hashlib.blake2b(
+            pickle.dumps(
+                (
+                    self._base_cnf.get_raw(),
+                    self.max_depth,
+                    self.candidates_limit,
+                    self.cube_backend,
+                )
+            ),
+            digest_size=16,
+        ).hexdigest()
+        cache_dir = pathlib.Path(self.cube_cache_dir)
+        path = cache_dir / f"cubes_{key}.pkl"
+        if path.exists():
+            try:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            except Exception:
+                logger.warning("Discarding unreadable cube cache %s", path)
+
+        if self.cube_backend == "march_cu":
+            cubes = list(self._cube_march(instance))
+        else:
+            cubes = list(self._cube(instance))
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cubes, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return cubes
+
+    def _cube_march(
+        self, instance: CircuitSatInstance
+    ) -> Iterator[CircuitSatInstance]:
+        """Cube with the external march_cu lookahead solver.
+
+        Dumps the base CNF as DIMACS, runs march_cu, and replays each
+        emitted cube (``a <lits> 0`` lines) onto a copy of the base
+        instance through the regular assign/propagate path, so the
+        resulting instances look exactly like natively-cubed ones.
+        """
+        var_map = instance.cnf.var_map
+        label_of = {lit: label for label, lit in var_map.items()}
+        raw = instance.cnf.get_raw()
+        with tempfile.TemporaryDirectory(prefix="aig_cube_march_") as tmp:
+            cnf_path = os.path.join(tmp, "base.cnf")
+            cubes_path = os.path.join(tmp, "cubes.icnf")
+            lines = [f"p cnf {max(var_map.values())} {len(raw)}\n"]
+            lines.extend(
+                " ".join(map(str, clause)) + " 0\n" for clause in raw
             )
-            instance.assign(selection.label, selection.forced_value)
-            return self._cube(instance, depth + 1)
-
-        result = []
-        for value in (False, True):
-            branch = copy.deepcopy(instance)
-            branch.assign(selection.label, value)
-            result.extend(self._cube(branch, depth + 1))
-        return result
+            with open(cnf_path, "w") as f:
+                f.writelines(lines)
+            subprocess.run(
+                [
+                    self.march_path,
+                    cnf_path,
+                    "-d",
+                    str(self.max_depth),
+                    "-o",
+                    cubes_path,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            with open(cubes_path) as f:
+                cube_lines = f.readlines()
+
+        for line in cube_lines:
+            if not line.startswith("a "):
+                continue
+            lits = [int(tok) for tok in line.split()[1:-1]]
+            cube = instance.copy()
+            refuted = False
+            for lit in lits:
+                label = label_of.get(abs(lit))
+                if label is None or label not in cube.circuit._gates:
+                    # Variable without a live gate (already folded away):
+                    # record the unit for the Conquer stage only.
+                    cube.cnf.add_clause((lit,))
+                    cube.assumptions.append(lit)
+                    continue
+                status = cube.assign(label, lit > 0)
+                if status != AssignmentStatus.OK:
+                    refuted = True
+                    break
+            if not refuted:
+                yield cube
 
     def _should_stop(self, instance: CircuitSatInstance, depth: int) -> bool:
         if instance.circuit.input_size == 0:
@@ -174,6 +682,10 @@ class CubeAndConquerSolver:
         if not candidates:
             return None
 
+        # Candidates are weighed serially on the live instance: each trial
+        # is an O(Δ) assign/rollback, so shipping the whole instance to
+        # worker processes would cost more than the lookahead itself.
+
         best_label = None
         best_weight = 0
 
@@ -188,31 +700,60 @@ class CubeAndConquerSolver:
         return _CubeGateSelection(label=best_label)
 
     def _rank_candidates(self, instance: CircuitSatInstance) -> list[str]:
-        """Stage 1: structural scoring sigma(g) = (indeg+1)*(outdeg+1)."""
-        circuit = instance.circuit
-        scores: list[tuple[int, str]] = []
+        """Stage 1: structural scoring sigma(g) = (indeg+1)*(outdeg+1).
 
-        for label in circuit.gates:
-            g = circuit.get_gate(label)
-            if g.gate_type in (ALWAYS_TRUE, ALWAYS_FALSE, NOT):
-                continue
-            assert g.gate_type in (AND, INPUT)
-
-            indegree = len(g.operands)
-
-            outdegree = 0
-            for user_label in circuit.get_gate_users(label):
-                user = circuit.get_gate(user_label)
-                if user.gate_type == NOT:
-                    outdegree += len(circuit.get_gate_users(user_label))
+        Scores are maintained incrementally: the whole circuit is scored
+        once per `cube` call, after which only the gates dirtied by
+        assignments and rollbacks since the previous ranking are rescored,
+        so each recursion node costs O(Δ) plus the top-K selection.
+        """
+        circuit = instance.circuit
+        scores = self._scores
+        if scores is None:
+            # Initial build: filter out NOT/constant gates up front so the
+            # one full-circuit pass only scores branchable gates; from here
+            # on the dict itself is the branchable index.
+            scores = self._scores = {}
+            skip = (ALWAYS_TRUE, ALWAYS_FALSE, NOT)
+            for label, g in circuit._gates.items():
+                if g.gate_type not in skip:
+                    scores[label] = self._score_gate(circuit, label)
+        else:
+            for label in instance.dirty_labels:
+                score = self._score_gate(circuit, label)
+                if score is None:
+                    scores.pop(label, None)
                 else:
-                    outdegree += 1
+                    scores[label] = score
+        instance.dirty_labels.clear()
+        # (score, label) tuples compare natively, so the K-of-N selection
+        # runs without a Python key function per element; score ties break
+        # on the label, which also makes the ranking order-independent.
+        top = heapq.nlargest(
+            self.candidates_limit, zip(scores.values(), scores.keys())
+        )
+        return [label for _, label in top]
+
+    @staticmethod
+    def _score_gate(circuit: Circuit, label: str) -> int | None:
+        """sigma for one gate, or None if it is gone / not branchable."""
+        gates = circuit._gates
+        users_map = circuit._gate_to_users
+        g = gates.get(label)
+        if g is None or g.gate_type in (ALWAYS_TRUE, ALWAYS_FALSE, NOT):
+            return None
+        assert g.gate_type in (AND, INPUT)
+
+        indegree = len(g.operands)
 
-            score = (indegree + 1) * (outdegree + 1)
-            scores.append((score, label))
+        outdegree = 0
+        for user_label in users_map.get(label, ()):
+            if gates[user_label].gate_type == NOT:
+                outdegree += len(users_map.get(user_label, ()))
+            else:
+                outdegree += 1
 
-        scores.sort(key=lambda x: x[0], reverse=True)
-        return [label for _, label in scores[: self.candidates_limit]]
+        return (indegree + 1) * (outdegree + 1)
 
     def _weight_gate(
         self, instance: CircuitSatInstance, label: str
@@ -221,11 +762,13 @@ class CubeAndConquerSolver:
         start_size = instance.circuit.size
         weight = 1
         for val in (False, True):
-            branch = copy.deepcopy(instance)
-            status = branch.assign(label, val)
+            token = instance.snapshot()
+            status = instance.assign(label, val, probe=True)
             if status != AssignmentStatus.OK:
+                instance.rollback(token)
                 return _GateWeightResult(forced_value=not val)
-            delta = start_size - branch.circuit.size
+            delta = start_size - instance.circuit.size
+            instance.rollback(token)
             assert delta > 0
             weight *= delta
         return _GateWeightResult(weight=weight)
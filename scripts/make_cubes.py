@@ -9,21 +9,20 @@ Usage::
 
 import argparse
 import os
-import sys
 import time
 
-sys.setrecursionlimit(10**6)
-
 from aig_cube.aig_parser import load_aig
 from aig_cube.solver import CubeAndConquerSolver
 
 
 def write_dimacs(clauses: list[list[int]], path: str) -> None:
     num_vars = max(abs(lit) for clause in clauses for lit in clause)
+    # One writelines call instead of a write per clause: the per-call
+    # overhead dominates for cubes with millions of clauses.
+    lines = [f"p cnf {num_vars} {len(clauses)}\n"]
+    lines.extend(" ".join(map(str, clause)) + " 0\n" for clause in clauses)
     with open(path, "w") as f:
-        f.write(f"p cnf {num_vars} {len(clauses)}\n")
-        for clause in clauses:
-            f.write(" ".join(map(str, clause)) + " 0\n")
+        f.writelines(lines)
 
 
 def main() -> None:
@@ -40,19 +39,24 @@ def main() -> None:
     solver = CubeAndConquerSolver(max_depth=args.depth, candidates_limit=args.candidates)
 
     t0 = time.time()
-    cubes = solver.cube(circuit)
-    cube_time = time.time() - t0
+    cubes_iter = solver.iter_cubes(circuit)
 
     if solver._trivial_result is not None:
         status = "SAT" if solver._trivial_result.answer else "UNSAT"
         print(f"Trivially {status} (no cubes to write)")
-        print(f"Cube time: {cube_time:.2f}s")
+        print(f"Cube time: {time.time() - t0:.2f}s")
         return
 
-    print(f"Generated {len(cubes)} cubes in {cube_time:.2f}s")
-    for i, instance in enumerate(cubes):
+    # Stream cubes to disk as the cube stage yields them, so deep runs
+    # never hold all 2^depth leaves in memory at once.
+    num_cubes = 0
+    for i, instance in enumerate(cubes_iter):
         path = os.path.join(args.output_dir, f"cube_{i:04d}.cnf")
         write_dimacs(instance.cnf.get_raw(), path)
+        num_cubes = i + 1
+    cube_time = time.time() - t0
+
+    print(f"Generated {num_cubes} cubes in {cube_time:.2f}s")
     print(f"Saved to {args.output_dir}/")
 
 
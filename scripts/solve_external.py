@@ -17,8 +17,7 @@ import subprocess
 import sys
 import tempfile
 import time
-
-sys.setrecursionlimit(10**6)
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from aig_cube.aig_parser import load_aig
 from aig_cube.solver import CubeAndConquerSolver
@@ -26,10 +25,12 @@ from aig_cube.solver import CubeAndConquerSolver
 
 def write_dimacs(clauses: list[list[int]], path: str) -> None:
     num_vars = max(abs(lit) for clause in clauses for lit in clause)
+    # One writelines call instead of a write per clause: the per-call
+    # overhead dominates for cubes with millions of clauses.
+    lines = [f"p cnf {num_vars} {len(clauses)}\n"]
+    lines.extend(" ".join(map(str, clause)) + " 0\n" for clause in clauses)
     with open(path, "w") as f:
-        f.write(f"p cnf {num_vars} {len(clauses)}\n")
-        for clause in clauses:
-            f.write(" ".join(map(str, clause)) + " 0\n")
+        f.writelines(lines)
 
 
 def run_external_solver(solver_path: str, cnf_path: str, timeout: float | None = None) -> tuple[bool | None, float]:
@@ -66,6 +67,7 @@ def main() -> None:
     parser.add_argument("-d", "--depth", type=int, default=4, help="Cube-stage depth (default: 4)")
     parser.add_argument("-k", "--candidates", type=int, default=10, help="Lookahead candidate set size K (default: 10)")
     parser.add_argument("-o", "--output", type=str, default=None, help="Write CSV results to this file")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Parallel solver processes (default: CPU count)")
     parser.add_argument("--timeout", type=float, default=None, help="Per-cube timeout in seconds")
     parser.add_argument("--keep-cnfs", type=str, default=None, help="Directory to keep cube CNFs (otherwise uses temp)")
     args = parser.parse_args()
@@ -74,18 +76,15 @@ def main() -> None:
     cnc = CubeAndConquerSolver(max_depth=args.depth, candidates_limit=args.candidates)
 
     t_cube_start = time.time()
-    cubes = cnc.cube(circuit)
-    t_cube_end = time.time()
-    cube_time = t_cube_end - t_cube_start
+    cubes_iter = cnc.iter_cubes(circuit)
 
     if cnc._trivial_result is not None:
+        cube_time = time.time() - t_cube_start
         status = "SAT" if cnc._trivial_result.answer else "UNSAT"
-        total = cube_time
         print(f"Trivially {status}")
-        print(f"Cube: {cube_time:.2f}s | Conquer: 0.00s | Total: {total:.2f}s")
+        print(f"Cube: {cube_time:.2f}s | Conquer: 0.00s | Total: {cube_time:.2f}s")
         return
 
-    print(f"Cubes: {len(cubes)} (cube time: {cube_time:.2f}s)")
     print(f"Solver: {args.solver}")
     print("-" * 80)
 
@@ -97,21 +96,39 @@ def main() -> None:
     else:
         os.makedirs(cnf_dir, exist_ok=True)
 
-    answer = False
-    conquer_time = 0.0
-    for i, instance in enumerate(cubes):
+    def solve_cube(i: int, instance) -> tuple[int, bool | None, float]:
         cnf_path = os.path.join(cnf_dir, f"cube_{i:04d}.cnf")
         write_dimacs(instance.cnf.get_raw(), cnf_path)
-
         sat, elapsed = run_external_solver(args.solver, cnf_path, args.timeout)
-        conquer_time += elapsed
+        return i, sat, elapsed
 
-        status_str = {True: "SAT", False: "UNSAT", None: "UNKNOWN"}[sat]
-        print(f"  cube {i:4d}/{len(cubes)}: {status_str}  ({elapsed:.2f}s)")
-
-        if sat is True:
-            answer = True
-            break
+    # Cubes are independent, so solver invocations run in a thread pool
+    # (the threads only wait on subprocesses); the first SAT answer
+    # cancels the cubes that have not started yet. Cubes are submitted as
+    # the cube stage yields them, overlapping cubing with solver runs.
+    jobs = args.jobs or os.cpu_count() or 1
+    answer = False
+    conquer_time = 0.0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(solve_cube, i, instance)
+            for i, instance in enumerate(cubes_iter)
+        ]
+        num_cubes = len(futures)
+        cube_time = time.time() - t_cube_start
+        print(f"Cubes: {num_cubes} (cube time: {cube_time:.2f}s)")
+        for future in as_completed(futures):
+            i, sat, elapsed = future.result()
+            conquer_time += elapsed
+
+            status_str = {True: "SAT", False: "UNSAT", None: "UNKNOWN"}[sat]
+            print(f"  cube {i:4d}/{num_cubes}: {status_str}  ({elapsed:.2f}s)")
+
+            if sat is True:
+                answer = True
+                for pending in futures:
+                    pending.cancel()
+                break
 
     total_time = cube_time + conquer_time
     final = "SAT" if answer else "UNSAT"
@@ -124,7 +141,7 @@ def main() -> None:
             w = csv.writer(f)
             w.writerow(["filename", "answer", "cubes", "cube_time", "conquer_time", "total_time"])
             w.writerow([
-                os.path.basename(args.input), final, len(cubes),
+                os.path.basename(args.input), final, num_cubes,
                 f"{cube_time:.6f}", f"{conquer_time:.6f}", f"{total_time:.6f}",
             ])
         print(f"Results written to {args.output}")
@@ -13,11 +13,8 @@ Usage::
 import argparse
 import csv
 import os
-import sys
 import time
 
-sys.setrecursionlimit(10**6)
-
 from aig_cube.aig_parser import load_aig
 from aig_cube.sat import PySATSolverNames
 from aig_cube.solver import CubeAndConquerSolver
